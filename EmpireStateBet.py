@@ -15,54 +15,200 @@ And also, you admit that you're a bit clumsy and have a chance of 0.1% of fallin
 Falling down means that you have to start again from step 0. 
 With all of this in mind, you bet your friend that you'll reach 60 steps high.
 What is the chance that you will win this bet?
+
+Notes:
+- All games are played side by side: each throw is one vectorized numpy step
+  over every walk, so steps are stored as int16 (max step is 6*n_rolls, so at
+  most 5461 throws per game).
+- simulate_walks keeps every path in an (n_rolls+1) x n_walks int16 array.
+- stream_walks keeps no paths at all. It plays the games in batches and keeps
+  per-step statistics in WalkStats: a running sum for the mean, a fixed-bin
+  histogram per step (one bin per stair) for percentile bands, and the first
+  step at which each walk went above the target. Memory does not depend on
+  n_walks, so 10**7 walks fit in the same few MB as 10**4.
 """
 
 # Import libraries
 import numpy as np
 import matplotlib.pyplot as plt
+from hotPathProfiler import instrument, track, add_items
 
 # set random seed
 np.random.seed(123)
 
-# initialize all walks list
-all_walks = []
+def check_rolls(n_rolls):
+    '''Raise ValueError if n_rolls throws could overflow an int16 step.'''
+    # most throws per game whose highest possible step (6 per throw) fits in int16
+    max_rolls = np.iinfo(np.int16).max // 6
+    if not 0 <= n_rolls <= max_rolls:
+        raise ValueError('n_rolls must be between 0 and ' + str(max_rolls) + ', got ' + str(n_rolls))
+
+def walk_steps(n_walks, n_rolls = 100):
+    '''Play n_walks games side by side, one throw at a time.
+
+    Args:
+        n_walks (int) : Number of games (random walks) to simulate
+        n_rolls (int) : Number of dice throws per game
+
+    Yields:
+        step (np.array) : int16 step of every walk after 0, 1, ..., n_rolls throws
+    '''
+    check_rolls(n_rolls)
+
+    # start every random walk at step 0
+    step = np.zeros(n_walks, dtype=np.int16)
+    yield step
+
+    for x in range(n_rolls) :
+        dice = np.random.randint(1, 7, size=n_walks, dtype=np.int16) # roll the die
+        bonus = np.random.randint(1, 7, size=n_walks, dtype=np.int16) # second roll (used on a six)
+
+        # roll <= 2: step down (no basement), 3 to 5: step up, 6: walk up the second roll
+        step = np.where(dice <= 2, np.maximum(step - 1, 0),
+                        np.where(dice <= 5, step + 1, step + bonus)).astype(np.int16)
 
-# simulate random walk 10,000 times
-for i in range(10000) :
-    
-    # start random walk at step 0
-    random_walk = [0]
-
-    # play the game 100 times
-    for x in range(100) :
-        step = random_walk[-1] # start at previous step
-        dice = np.random.randint(1,7) # roll the die
-        if dice <= 2 : # if roll less than 2, step down
-            step = max(0, step - 1) # assume no basement (i.e. floor 0 is min)
-        elif dice <= 5 : # if roll between 3 and 5, step up
-            step = step + 1
-        else : # if roll a six, roll again and walk up that many steps
-            step = step + np.random.randint(1,7)
-        
         # implement probability of falling down stairs (to floor 0)
-        if np.random.rand() <= 0.001 : # simulate a random number, if less that 0.1%, fall to ground floor
-            step = 0
-        
-        # add result of roll/steps to list
-        random_walk.append(step)
-    
-    # save the result of the game
-    all_walks.append(random_walk)
-
-# create np array of game results
-np_aw_t = np.transpose(np.array(all_walks))
-
-# select last row from np_aw_t: ends
-ends = np_aw_t[-1,:]
-
-# Plot histogram of ends, display plot
-plt.hist(ends)
+        step[np.random.rand(n_walks) <= 0.001] = 0
+
+        yield step
+
+@instrument
+def simulate_walks(n_walks, n_rolls = 100):
+    '''Play the Empire State game n_walks times and keep every path.
+
+    Args:
+        n_walks (int) : Number of games (random walks) to simulate
+        n_rolls (int) : Number of dice throws per game
+
+    Returns:
+        all_walks (np.array) : int16 array of shape (n_rolls+1, n_walks), one column per game
+    '''
+    check_rolls(n_rolls)
+    all_walks = np.empty((n_rolls+1, n_walks), dtype=np.int16)
+    for t, step in enumerate(walk_steps(n_walks, n_rolls)):
+        all_walks[t] = step
+
+    add_items(n_walks)
+    return all_walks
+
+class WalkStats(object):
+    '''Per-step statistics of many random walks, in constant memory.
+
+    Args:
+        n_rolls (int) : Number of dice throws per game
+        target (int) : Step the walks must go above to win the bet
+    '''
+
+    def __init__(self, n_rolls = 100, target = 60):
+        check_rolls(n_rolls)
+        self.n_rolls = n_rolls
+        self.target = target
+        self.n_walks = 0
+        self.total = np.zeros(n_rolls+1)                                     # sum of steps per throw
+        self.counts = np.zeros((n_rolls+1, 6*n_rolls+1), dtype=np.int64)     # walks on each stair per throw
+        self.first_cross = np.zeros(n_rolls+2, dtype=np.int64)               # walks first above target per throw (last bin: never)
+
+    def add(self, steps):
+        '''Add one batch of walks.
+
+        Args:
+            steps (iterable) : int16 step arrays per throw (n_rolls+1 of them), e.g. walk_steps(n)
+        '''
+        # accumulate the batch separately so a bad batch leaves the statistics untouched
+        total = np.zeros_like(self.total)
+        counts = np.zeros_like(self.counts)
+        crossed = None
+        n_steps = 0
+        for t, step in enumerate(steps):
+            if t > self.n_rolls:
+                raise ValueError('steps has more than n_rolls+1 = ' + str(self.n_rolls+1) + ' throws')
+            if crossed is None:
+                crossed = np.full(len(step), self.n_rolls+1, dtype=np.int16)
+            total[t] = step.sum()
+            counts[t] = np.bincount(step, minlength=counts.shape[1])
+            crossed[(step > self.target) & (crossed > t)] = t
+            n_steps += 1
+
+        if n_steps != self.n_rolls+1:
+            raise ValueError('steps must have n_rolls+1 = ' + str(self.n_rolls+1) + ' throws, got ' + str(n_steps))
+
+        self.total += total
+        self.counts += counts
+        self.first_cross += np.bincount(crossed, minlength=self.n_rolls+2)
+        self.n_walks += len(crossed)
+
+    def check_walks(self):
+        '''Raise ValueError if no walks have been added yet.'''
+        if self.n_walks == 0:
+            raise ValueError('no walks added to WalkStats')
+
+    def mean(self):
+        '''Mean step after each throw.'''
+        self.check_walks()
+        return self.total / self.n_walks
+
+    def percentile(self, q):
+        '''q-th percentile (0-100) of the step after each throw, read from the histograms.'''
+        self.check_walks()
+        cdf = np.cumsum(self.counts, axis=1)
+        return np.argmax(cdf >= q / 100 * self.n_walks, axis=1)
+
+    def ends(self):
+        '''Number of walks finishing on each stair (histogram of the last throw).'''
+        self.check_walks()
+        return self.counts[-1]
+
+    def prob_win(self):
+        '''Chance of finishing above the target.'''
+        self.check_walks()
+        return self.ends()[self.target+1:].sum() / self.n_walks
+
+@instrument
+def stream_walks(n_walks, n_rolls = 100, target = 60, batch_size = 100000):
+    '''Play the Empire State game n_walks times without storing the paths.
+
+    Args:
+        n_walks (int) : Number of games (random walks) to simulate
+        n_rolls (int) : Number of dice throws per game
+        target (int) : Step the walks must go above to win the bet
+        batch_size (int) : Walks played side by side (bounds the memory used)
+
+    Returns:
+        stats (WalkStats) : Per-step mean, histograms and first crossing of the target
+    '''
+    if n_walks <= 0:
+        raise ValueError('n_walks must be positive, got ' + str(n_walks))
+
+    stats = WalkStats(n_rolls, target)
+    for start in range(0, n_walks, batch_size):
+        stats.add(walk_steps(min(batch_size, n_walks - start), n_rolls))
+
+    add_items(n_walks)
+    return stats
+
+# simulate random walk 10,000 times
+stats = stream_walks(10000)
+steps = np.arange(stats.n_rolls+1)
+
+with track('EmpireStateBet.plot'):
+    # Plot percentile bands of the paths
+    plt.subplot(1, 2, 1)
+    plt.fill_between(steps, stats.percentile(5), stats.percentile(95), alpha=0.2, label='5-95%')
+    plt.fill_between(steps, stats.percentile(25), stats.percentile(75), alpha=0.4, label='25-75%')
+    plt.plot(steps, stats.percentile(50), label='median')
+    plt.plot(steps, stats.mean(), linestyle='--', label='mean')
+    plt.axhline(stats.target, color='grey', linewidth=0.5)
+    plt.xlabel('Throw')
+    plt.ylabel('Step')
+    plt.legend()
+
+    # Plot histogram of ends from the bincount of the last throw
+    ends = stats.ends()
+    plt.subplot(1, 2, 2)
+    plt.bar(np.arange(len(ends)), ends, width=1)
+    plt.xlim(0, np.nonzero(ends)[0][-1] + 1)
+    plt.xlabel('Final step')
 plt.show()
 
 # calculate probability of being greater than step 60
-print(sum(ends>60)/10000)
+print(stats.prob_win())
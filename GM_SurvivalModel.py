@@ -31,6 +31,7 @@ Notes:
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from hotPathProfiler import instrument, track, add_items
 
 #----------PART 1: Define Functions----------
 def vt(i, t):
@@ -100,6 +101,7 @@ def tfx(A, B, c, x, t):
     tfx = (A + B*(c**(x+t))) * np.exp(-A*t - (B/np.log(c)) * (c**x) * (c**t-1))
     return tfx
 
+@instrument
 def calc_Ax(A, B, c, x, i):
     '''APV of a $1 whole life policy of someone aged x
     following a Gompertz-Makeham survival model.
@@ -127,6 +129,7 @@ def calc_Ax(A, B, c, x, i):
 
     return Ax
 
+@instrument
 def calc_Ax_2(A, B, c, x, i):
     '''Second moment of a $1 whole life policy of someone aged x
     following a Gompertz-Makeham survival model.
@@ -154,6 +157,7 @@ def calc_Ax_2(A, B, c, x, i):
 
     return Ax_2
 
+@instrument
 def calc_ax(A, B, c, x, i, due = True):
     '''APV of a $1 whole life annuity of someone aged x,
     following a Gompertz-Makeham survival model.
@@ -221,67 +225,69 @@ i = 0.05        # interest rate
 v = 1/(1+i)     # discount factor
 d = i*v         # equivalent discount rate
 
-#-----Age and Number of Lives-----
-# initialize life table as list
-X = []
-L = [lx]
+with track('GM_SurvivalModel.build_table'):
+    #-----Age and Number of Lives-----
+    # initialize life table as list
+    X = []
+    L = [lx]
 
-# create age column as list
-for j in range(x, 101):
-    X.append(j)
+    # create age column as list
+    for j in range(x, 101):
+        X.append(j)
 
-# create life column as list
-for j in range(x, 101):
-    L.append(L[-1]*tPx(A, B, c, j, t))
+    # create life column as list
+    for j in range(x, 101):
+        L.append(L[-1]*tPx(A, B, c, j, t))
 
-#-----Whole Life Annuity Due-----
-# initialize ax list
-ax_due = []
+    #-----Whole Life Annuity Due-----
+    # initialize ax list
+    ax_due = []
 
-for j in range(x, 101):
-    ax_due.append(calc_ax(A, B, c, x=j, i=i, due=True))
+    for j in range(x, 101):
+        ax_due.append(calc_ax(A, B, c, x=j, i=i, due=True))
 
-#-----Whole Life Policy, Ax (recursively)-----
-# Assume terminal age of 130 since q129 is very close to 1
-q129 = 1-tPx(A, B, c, x=129, t=1)
-#print(q129)
+    #-----Whole Life Policy, Ax (recursively)-----
+    # Assume terminal age of 130 since q129 is very close to 1
+    q129 = 1-tPx(A, B, c, x=129, t=1)
+    #print(q129)
 
-# Per Example 4.1 from Dickson, page 85
-A129 = v
-Ax_recur = [A129]
+    # Per Example 4.1 from Dickson, page 85
+    A129 = v
+    Ax_recur = [A129]
 
-# Calculate values of Ax recursively from A129
-for j in range(128, x-1, -1):
-    px = tPx(A, B, c, x=j, t=1)
-    qx = 1-px
-    Aj = v * qx + v * px * Ax_recur[0]
-    Ax_recur.insert(0, Aj)
+    # Calculate values of Ax recursively from A129
+    for j in range(128, x-1, -1):
+        px = tPx(A, B, c, x=j, t=1)
+        qx = 1-px
+        Aj = v * qx + v * px * Ax_recur[0]
+        Ax_recur.insert(0, Aj)
 
-#-----Whole Life Policy, Ax (directly)-----
-Ax_direct = []
+    #-----Whole Life Policy, Ax (directly)-----
+    Ax_direct = []
 
-for k in range(x, 101):
-    Ax_direct.append(calc_Ax(A, B, c, x=k, i=i))
+    for k in range(x, 101):
+        Ax_direct.append(calc_Ax(A, B, c, x=k, i=i))
 
-#-----Second Moment of Whole Life Policy-----
-Ax_2 = []
+    #-----Second Moment of Whole Life Policy-----
+    Ax_2 = []
 
-for k in range(x, 101):
-    Ax_2.append(calc_Ax_2(A, B, c, x=k, i=i))
+    for k in range(x, 101):
+        Ax_2.append(calc_Ax_2(A, B, c, x=k, i=i))
 
-#-----Pure Endowment of 5, 10 and 20 years-----
-Ex_5 = []
-Ex_10 = []
-Ex_20 = []
+    #-----Pure Endowment of 5, 10 and 20 years-----
+    Ex_5 = []
+    Ex_10 = []
+    Ex_20 = []
 
-for k in range(x, 101):
-    Ex_5.append(nEx(A, B, c, x=k, n=5, i=i))
-    Ex_10.append(nEx(A, B, c, x=k, n=10, i=i))
-    Ex_20.append(nEx(A, B, c, x=k, n=20, i=i))
+    for k in range(x, 101):
+        Ex_5.append(nEx(A, B, c, x=k, n=5, i=i))
+        Ex_10.append(nEx(A, B, c, x=k, n=10, i=i))
+        Ex_20.append(nEx(A, B, c, x=k, n=20, i=i))
 
-#-----Create pandas DataFrame-----
-SUSM_df = pd.DataFrame(data=list(zip(X, L, ax_due, Ax_recur, Ax_direct, Ax_2, Ex_5, Ex_10, Ex_20)), 
-                       columns=['Age', 'lx', 'ax_due', 'Ax_recur', 'Ax_direct', 'Ax_2', 'Ex_5', 'Ex_10', 'Ex_20'])
+    #-----Create pandas DataFrame-----
+    SUSM_df = pd.DataFrame(data=list(zip(X, L, ax_due, Ax_recur, Ax_direct, Ax_2, Ex_5, Ex_10, Ex_20)), 
+                           columns=['Age', 'lx', 'ax_due', 'Ax_recur', 'Ax_direct', 'Ax_2', 'Ex_5', 'Ex_10', 'Ex_20'])
+    add_items(len(SUSM_df)) # rows built
 
 # check ages 20-39 and 70-80
 print(SUSM_df[0:20])
@@ -321,15 +327,17 @@ q_estimate.set_index('Age', inplace=True)
 
 #-----Download Canadian Mortality Rates-----
 # Note: Modified the .csv file to get file down to two columns: Age and qx
-q_actual = pd.read_csv('Canadian_Mortality.csv', index_col='Age')
+with track('GM_SurvivalModel.read_csv'):
+    q_actual = pd.read_csv('Canadian_Mortality.csv', index_col='Age')
 
 #-----Create DataFrame-----
 MortalityRates = pd.concat([q_estimate, q_actual], axis=1)
 MortalityRates.columns = ['Model', 'Actual']
 
 #-----Create plot-----
-MortalityRates.plot()
-plt.title('Gompertz-Makeham Model vs. Canadian Mortality')
-plt.ylabel('Chance of Death per Year')
-plt.yscale('log')
+with track('GM_SurvivalModel.plot'):
+    MortalityRates.plot()
+    plt.title('Gompertz-Makeham Model vs. Canadian Mortality')
+    plt.ylabel('Chance of Death per Year')
+    plt.yscale('log')
 plt.show()
\ No newline at end of file
@@ -5,6 +5,8 @@
 # - freqAll: returns a dictionary of all unique words in the text and their frequency
 # - freqOf: returns the frequency of the word
 
+from hotPathProfiler import instrument, add_items
+
 class analyzedText(object):
     
     # Constructor
@@ -20,10 +22,12 @@ class analyzedText(object):
         self.fmtText = formattedText
     
     # Method
+    @instrument
     def freqAll(self):        
         
         # extract words from fmtText
         wordList = self.fmtText.split(' ')
+        add_items(len(wordList))
         
         # define dictionary
         freqMap = {}
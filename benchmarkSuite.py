@@ -0,0 +1,339 @@
+'''
+Benchmark Suite for the Hot Paths
+
+Author: griffijt
+Purpose:
+- Part 1: Load the core functions from each exercise without running its demo code
+- Part 2: Generate synthetic inputs at several scales
+- Part 3: Time each path, record peak memory and save the results as JSON
+- Part 4: Compare the results to a saved baseline and fail on regressions
+
+Paths measured:
+    survival_table : calc_Ax and calc_ax table build (GM_SurvivalModel.py), scaled by table rows
+    walks          : simulate_walks (EmpireStateBet.py), scaled by number of walks
+    walk_stats     : stream_walks (EmpireStateBet.py), scaled by number of walks
+    freq_all       : analyzedText.freqAll (analyzedText.py), scaled by corpus size in words
+    clean_files    : cleanFiles (cleanFiles.py), scaled by registry rows
+    count_entries  : count_entries (defCountColValues.py), scaled by CSV rows
+
+Usage:
+    python benchmarkSuite.py                     # run all scales, write bench_results.json
+    python benchmarkSuite.py --quick             # smallest scale only
+    python benchmarkSuite.py --save-baseline     # store this run as bench_baseline.json
+    python benchmarkSuite.py --threshold 1.25    # fail if a path is >25% slower/larger than baseline
+
+Notes:
+- Each exercise runs its demo (plots, prints, file writes) at import time, so Part 1
+  executes only the imports and def/class statements of each script.
+- Wall time is the best of several repeats; peak memory is measured in a separate
+  run under tracemalloc so that tracing does not distort the timings.
+- Baseline timings below NOISE_FLOOR seconds are too noisy to compare as they are,
+  so they are raised to NOISE_FLOOR before applying the threshold. Likewise, memory
+  peaks below MEMORY_FLOOR KiB are raised to MEMORY_FLOOR (allocator noise).
+'''
+# import libraries
+import argparse
+import ast
+import atexit
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# use a non-interactive backend, in case an exercise imports pyplot
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_FILE = os.path.join(HERE, 'bench_results.json')
+BASELINE_FILE = os.path.join(HERE, 'bench_baseline.json')
+NOISE_FLOOR = 0.001   # seconds
+MEMORY_FLOOR = 64     # KiB
+
+# input sizes per path (the first entry is used by --quick)
+SCALES = {
+    'survival_table': [10, 40, 81],         # table rows (ages)
+    'walks': [100, 1000, 10000],            # number of walks
+    'walk_stats': [10000, 100000, 1000000], # number of walks
+    'freq_all': [500, 2000, 8000],          # words in corpus
+    'clean_files': [100, 1000, 5000],       # registry rows
+    'count_entries': [1000, 10000, 100000], # CSV rows
+}
+
+#----------PART 1: Load Functions----------
+def load_functions(script):
+    '''Execute only the imports and definitions of an exercise script.
+
+    Args:
+        script (str) : File name of the exercise, relative to this file
+
+    Returns:
+        namespace (dict) : Names defined by the script (functions, classes, modules)
+    '''
+    path = os.path.join(HERE, script)
+    with open(path, 'r', encoding='utf-8-sig') as readFile:
+        tree = ast.parse(readFile.read(), filename=path)
+
+    # drop everything except imports and definitions (i.e. the demo code)
+    keep = (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef)
+    tree.body = [node for node in tree.body if isinstance(node, keep)]
+
+    namespace = {'__name__': os.path.splitext(script)[0], '__file__': path}
+    exec(compile(tree, path, 'exec'), namespace)
+    return namespace
+
+#----------PART 2: Synthetic Inputs----------
+# each make_* function returns (setup, run):
+# setup() builds fresh inputs for one repeat, run(inputs) is the timed call
+
+WORDS = ['lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consetetur', 'sadipscing', 'elitr',
+         'sed', 'diam', 'nonumy', 'eirmod', 'tempor', 'invidunt', 'ut', 'labore',
+         'et', 'dolore', 'magna', 'aliquyam', 'erat', 'voluptua', 'at', 'vero']
+
+def make_survival_table(rows):
+    ns = load_functions('GM_SurvivalModel.py')
+    calc_Ax, calc_ax = ns['calc_Ax'], ns['calc_ax']
+
+    # SUSM parameters from Dickson
+    A, B, c, i = 0.00022, 2.7*10**(-6), 1.124, 0.05
+
+    def run(ages):
+        Ax = [calc_Ax(A, B, c, x=k, i=i) for k in ages]
+        ax = [calc_ax(A, B, c, x=k, i=i, due=True) for k in ages]
+        return Ax, ax
+
+    return (lambda: range(20, 20+rows)), run
+
+def make_walks(n_walks):
+    ns = load_functions('EmpireStateBet.py')
+    np, simulate_walks = ns['np'], ns['simulate_walks']
+
+    def setup():
+        np.random.seed(123)
+        return n_walks
+
+    return setup, simulate_walks
+
+def make_walk_stats(n_walks):
+    ns = load_functions('EmpireStateBet.py')
+    np, stream_walks = ns['np'], ns['stream_walks']
+
+    def setup():
+        np.random.seed(123)
+        return n_walks
+
+    return setup, stream_walks
+
+def make_freq_all(n_words):
+    ns = load_functions('analyzedText.py')
+    analyzedText = ns['analyzedText']
+
+    def setup():
+        rng = random.Random(123)
+        text = ' '.join(rng.choice(WORDS) for _ in range(n_words))
+        return analyzedText(text.capitalize() + '.')
+
+    return setup, lambda passage: passage.freqAll()
+
+def make_clean_files(n_rows):
+    ns = load_functions('cleanFiles.py')
+    cleanFiles = ns['cleanFiles']
+    tmpDir = tempfile.mkdtemp(prefix='bench_clean_')
+    atexit.register(shutil.rmtree, tmpDir, ignore_errors=True)
+    memReg = os.path.join(tmpDir, 'members.txt')
+    exReg = os.path.join(tmpDir, 'inactive.txt')
+
+    def write_registry(path, rows, rng, active):
+        # same layout as genFiles in cleanFiles.py
+        with open(path, 'w') as writefile:
+            writefile.write('Membership No  Date Joined  Active  \n')
+            data = "{:^13}  {:<11}  {:<6}\n"
+            for rowno in range(rows):
+                date = str(rng.randint(2015,2020)) + '-' + str(rng.randint(1,12)) + '-' + str(rng.randint(1,25))
+                status = rng.choice(('yes','no')) if active else 'no'
+                writefile.write(data.format(rng.randint(10000,99999), date, status))
+
+    def setup():
+        rng = random.Random(123)
+        write_registry(memReg, n_rows, rng, active=True)
+        write_registry(exReg, max(1, n_rows // 10), rng, active=False)
+        return memReg, exReg
+
+    return setup, lambda files: cleanFiles(*files)
+
+def make_count_entries(n_rows):
+    ns = load_functions('defCountColValues.py')
+    pd, count_entries = ns['pd'], ns['count_entries']
+
+    # same columns as the GOP debate tweet data
+    rng = random.Random(123)
+    candidates = ['Donald Trump', 'Jeb Bush', 'Ted Cruz', 'Marco Rubio', 'John Kasich', 'No candidate mentioned']
+    sentiments = ['Negative', 'Neutral', 'Positive']
+    df = pd.DataFrame({'candidate': [rng.choice(candidates) for _ in range(n_rows)],
+                       'sentiment': [rng.choice(sentiments) for _ in range(n_rows)]})
+
+    return (lambda: df), lambda frame: count_entries(frame, 'candidate', 'sentiment')
+
+PATHS = {
+    'survival_table': make_survival_table,
+    'walks': make_walks,
+    'walk_stats': make_walk_stats,
+    'freq_all': make_freq_all,
+    'clean_files': make_clean_files,
+    'count_entries': make_count_entries,
+}
+
+#----------PART 3: Time and Measure----------
+def measure(setup, run, repeat):
+    '''Time a path and record its peak memory.
+
+    Args:
+        setup (func) : Builds the inputs for one call (not timed)
+        run (func) : Hot path, called with the output of setup
+        repeat (int) : Number of timed calls (best is kept)
+
+    Returns:
+        result (dict) : Best wall time in seconds and peak traced memory in KiB
+    '''
+    times = []
+    for rep in range(repeat):
+        inputs = setup()
+        start = time.perf_counter()
+        run(inputs)
+        times.append(time.perf_counter() - start)
+
+    # separate traced call for peak memory (leave tracing on if someone else started it)
+    inputs = setup()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    run(inputs)
+    peak = tracemalloc.get_traced_memory()[1] - before
+    if not was_tracing:
+        tracemalloc.stop()
+
+    return {'seconds': min(times), 'peak_kib': peak / 1024}
+
+def planned_keys(paths, quick = False):
+    '''Result keys that run_suite will try to produce.'''
+    return {'{}[{}]'.format(name, scale)
+            for name in paths for scale in (SCALES[name][:1] if quick else SCALES[name])}
+
+def run_suite(paths, quick = False, repeat = 3):
+    '''Run every path at every scale.
+
+    Returns:
+        results (dict) : Keys like 'walks[1000]' mapped to the output of measure
+    '''
+    results = {}
+    for name in paths:
+        scales = SCALES[name][:1] if quick else SCALES[name]
+        for scale in scales:
+            key = '{}[{}]'.format(name, scale)
+            try:
+                setup, run = PATHS[name](scale)
+            except ImportError as err:
+                # missing optional library (e.g. numpy, pandas): skip this path
+                print('{:<28} skipped ({})'.format(key, err))
+                break
+            results[key] = measure(setup, run, repeat)
+            print('{:<28} {:>10.4f} s {:>12.1f} KiB'.format(key, results[key]['seconds'], results[key]['peak_kib']))
+    return results
+
+#----------PART 4: Compare to Baseline----------
+def compare(results, baseline, threshold, expected = None):
+    '''List the paths that regressed past threshold compared with baseline.
+
+    Args:
+        results (dict) : Output of run_suite
+        baseline (dict) : Output of run_suite from a saved run
+        threshold (float) : Allowed ratio of current / baseline (e.g. 1.5 = 50% slower)
+        expected (set) : Keys this run was meant to produce (default: every baseline key)
+
+    Returns:
+        regressions (list) : Human readable description of each regression
+    '''
+    regressions = []
+
+    # baseline paths that were skipped (e.g. failed to import) or dropped
+    for key in baseline:
+        if key not in results and (expected is None or key in expected):
+            regressions.append('{}: in baseline but not measured'.format(key))
+
+    for key in results:
+        if key not in baseline:
+            continue
+        old, new = baseline[key], results[key]
+
+        # time regressions (baselines too small to measure reliably count as NOISE_FLOOR)
+        if new['seconds'] > max(old['seconds'], NOISE_FLOOR) * threshold:
+            regressions.append('{}: {:.4f} s -> {:.4f} s ({:.2f}x)'.format(
+                key, old['seconds'], new['seconds'], new['seconds'] / max(old['seconds'], NOISE_FLOOR)))
+
+        # memory regressions (baselines too small to measure reliably count as MEMORY_FLOOR)
+        if new['peak_kib'] > max(old['peak_kib'], MEMORY_FLOOR) * threshold:
+            regressions.append('{}: {:.1f} KiB -> {:.1f} KiB ({:.2f}x)'.format(
+                key, old['peak_kib'], new['peak_kib'], new['peak_kib'] / max(old['peak_kib'], MEMORY_FLOOR)))
+
+    return regressions
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description='Benchmark the hot paths of the analysis exercises.')
+    parser.add_argument('paths', nargs='*', help='paths to run: ' + ', '.join(PATHS) + ' (default: all)')
+    parser.add_argument('--quick', action='store_true', help='run the smallest scale only')
+    parser.add_argument('--repeat', type=int, default=3, help='timed calls per scale (default: 3)')
+    parser.add_argument('--threshold', type=float, default=1.5, help='allowed current/baseline ratio (default: 1.5)')
+    parser.add_argument('--output', default=RESULTS_FILE, help='where to write the results JSON')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='also save this run as the baseline')
+    args = parser.parse_args(argv)
+
+    # check requested path names
+    for name in args.paths:
+        if name not in PATHS:
+            parser.error('unknown path: ' + name)
+
+    results = run_suite(args.paths or list(PATHS), quick=args.quick, repeat=args.repeat)
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+    with open(args.output, 'w') as writeFile:
+        json.dump(report, writeFile, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as writeFile:
+            json.dump(report, writeFile, indent=2)
+        print('Baseline saved to ' + args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('No baseline found at ' + args.baseline + ' (run with --save-baseline to create one)')
+        return 0
+
+    with open(args.baseline, 'r') as readFile:
+        baseline = json.load(readFile)['results']
+
+    # only expect the baseline keys of the paths/scales picked on the command line
+    expected = planned_keys(args.paths or list(PATHS), args.quick) if (args.paths or args.quick) else None
+    regressions = compare(results, baseline, args.threshold, expected)
+    if regressions:
+        print('Regressions past {:.2f}x baseline:'.format(args.threshold))
+        for line in regressions:
+            print('  ' + line)
+        return 1
+
+    print('No regressions past {:.2f}x baseline.'.format(args.threshold))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
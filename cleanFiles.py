@@ -12,6 +12,8 @@
 # call the random integer function from the Python 3 'random' module rnd 
 from random import randint as rnd
 
+from hotPathProfiler import instrument, add_items
+
 # name the files
 memReg = 'members.txt'
 exReg = 'inactive.txt'
@@ -20,6 +22,7 @@ exReg = 'inactive.txt'
 fee =('yes','no')
 
 # define genFiles function used to generate the random data files
+@instrument
 def genFiles(current,old):
     
     # create current membership file
@@ -59,6 +62,7 @@ with open(exReg,'r') as readFile:
 
 # Purpose: define function to remove inactive members from active file and put them in inactive file
 
+@instrument
 def cleanFiles(currentMem,exMem):
     '''
     currentMem: File containing list of current members
@@ -72,6 +76,7 @@ def cleanFiles(currentMem,exMem):
             members = writeFile.readlines() # store members in a list object
             header = members[0] # save header as variable
             members.pop(0) # remove header from members list
+            add_items(len(members)) # count rows for the profiler
             
             # add members to inactive List if not active
             inactive = [member for member in members if ('no' in member)]
@@ -13,11 +13,14 @@ Combines column name and value counts intos single dictionary.
 
 # import libraries
 import pandas as pd
+from hotPathProfiler import instrument, track, add_items
 
 # import data
-tweets_df = pd.read_csv('Sentiment.csv')
+with track('defCountColValues.read_csv'):
+    tweets_df = pd.read_csv('Sentiment.csv')
 
 # Define count_entries()
+@instrument
 def count_entries(df, *args):
     """Return a dictionary with counts of unique column values as the value for each key.
        Raises error is column name does not exist."""
@@ -33,6 +36,7 @@ def count_entries(df, *args):
 
         # Extract column from DataFrame: col
         col = df[col_name]
+        add_items(len(col))
         
         # Iterate over candidate column in DataFrame
         for entry in col:
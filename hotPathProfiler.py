@@ -0,0 +1,238 @@
+'''
+Hot-Path Profiler
+
+Author: griffijt
+Purpose:
+- Opt-in instrumentation for the core functions of the analysis exercises
+- Records call counts, wall time, items processed and allocation peaks
+  into one process-wide registry
+- Exports the registry as a text report or a cProfile-compatible dump
+  (readable with pstats, snakeviz, etc.)
+
+Usage:
+    from hotPathProfiler import instrument, track, add_items
+
+    @instrument                         # time every call of a function
+    def count_entries(df, *args):
+        ...
+        add_items(len(col))             # count rows/items processed by the current call
+
+    with track('read_csv'):             # time a block of script code
+        df = pd.read_csv('Sentiment.csv')
+
+    Turn it on from the shell, without touching the scripts:
+        HOTPATH_PROFILE=1 python EmpireStateBet.py                 # print report at exit ('0' or '' = off)
+        HOTPATH_PROFILE_DUMP=walks.prof python EmpireStateBet.py   # also write pstats dump
+        python -m pstats walks.prof
+
+    Or from code: enable(memory=True), report(), dump_stats('out.prof'), reset()
+
+Notes:
+- When disabled (the default) a wrapped call costs one global flag check.
+- Allocation peaks use tracemalloc, which slows everything down noticeably,
+  so they are only recorded with enable(memory=True) or HOTPATH_PROFILE_MEMORY=1.
+  The peak of an outer call includes the peaks of its instrumented children.
+- Self time excludes time spent in instrumented children, as in cProfile.
+'''
+# import libraries
+import atexit
+import functools
+import marshal
+import os
+import time
+import tracemalloc
+
+# process-wide state
+_enabled = False
+_memory = False
+_started_tracing = False    # True if enable() started tracemalloc (so disable() may stop it)
+_registry = {}      # key -> Stats
+_stack = []         # frames of the instrumented calls currently running
+
+class Stats(object):
+    '''Accumulated measurements for one instrumented function or block.'''
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.total = 0.0        # wall time including children (seconds)
+        self.own = 0.0          # wall time excluding instrumented children (seconds)
+        self.items = 0          # rows/items processed, as reported by add_items
+        self.peak = 0           # largest allocation peak of a single call (bytes)
+        self.callers = {}       # caller key -> [calls, own, total]
+
+class _Frame(object):
+    __slots__ = ('key', 'start', 'child', 'items', 'mem', 'peak')
+
+    def __init__(self, key):
+        self.key = key
+        self.child = 0.0
+        self.items = 0
+        self.mem = 0            # traced memory at entry (bytes)
+        self.peak = 0           # highest traced memory seen before the last reset_peak (bytes)
+        self.start = 0.0
+
+#----------Switches----------
+def enable(memory = False):
+    '''Start recording. If memory is True, also record allocation peaks (slow).'''
+    global _enabled, _memory, _started_tracing
+    _memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracing = True
+    _enabled = True
+
+def disable():
+    '''Stop recording (the registry is kept).'''
+    global _enabled, _memory, _started_tracing
+    if _started_tracing and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _started_tracing = False
+    _enabled = False
+    _memory = False
+
+def is_enabled():
+    return _enabled
+
+def reset():
+    '''Clear the registry.'''
+    _registry.clear()
+
+#----------Recording----------
+def _enter(key):
+    frame = _Frame(key)
+    if _memory:
+        # fold the running peak into the parent before resetting it for this frame
+        current, peak = tracemalloc.get_traced_memory()
+        if _stack:
+            _stack[-1].peak = max(_stack[-1].peak, peak)
+        frame.mem = frame.peak = current
+        tracemalloc.reset_peak()
+    _stack.append(frame)
+    frame.start = time.perf_counter()
+    return frame
+
+def _exit(frame):
+    elapsed = time.perf_counter() - frame.start
+    _stack.pop()
+
+    stats = _registry.get(frame.key)
+    if stats is None:
+        stats = _registry[frame.key] = Stats(frame.key[2])
+    stats.calls += 1
+    stats.total += elapsed
+    stats.own += elapsed - frame.child
+    stats.items += frame.items
+    if _memory:
+        peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+        stats.peak = max(stats.peak, peak - frame.mem)
+        if _stack:
+            _stack[-1].peak = max(_stack[-1].peak, peak)
+
+    # charge the time to the caller
+    caller = _stack[-1].key if _stack else ('~', 0, '<script>')
+    entry = stats.callers.setdefault(caller, [0, 0.0, 0.0])
+    entry[0] += 1
+    entry[1] += elapsed - frame.child
+    entry[2] += elapsed
+    if _stack:
+        _stack[-1].child += elapsed
+
+def add_items(n):
+    '''Add n to the items processed by the innermost instrumented call.'''
+    if _enabled and _stack:
+        _stack[-1].items += n
+
+def instrument(func = None, name = None):
+    '''Decorator that records every call of func while profiling is enabled.
+
+    Args:
+        func (func) : Function to wrap (allows use as @instrument)
+        name (str) : Name shown in reports (default: module.qualname)
+
+    Returns:
+        wrapper (func) : Calls func, timing it only while profiling is enabled
+    '''
+    if func is None:
+        return lambda f: instrument(f, name=name)
+
+    code = func.__code__
+    key = (code.co_filename, code.co_firstlineno,
+           name or '{}.{}'.format(func.__module__, func.__qualname__))
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        frame = _enter(key)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _exit(frame)
+
+    return wrapper
+
+class track(object):
+    '''Context manager that records a block of code under name.'''
+
+    def __init__(self, name):
+        self.key = ('~', 0, name)
+        self.frame = None
+
+    def __enter__(self):
+        if _enabled:
+            self.frame = _enter(self.key)
+        return self
+
+    def __exit__(self, *exc):
+        if self.frame is not None:
+            _exit(self.frame)
+            self.frame = None
+        return False
+
+#----------Export----------
+def report(sort = 'total'):
+    '''Text report of the registry, sorted by 'total', 'own', 'calls' or 'items'.
+
+    Returns:
+        text (str) : One row per instrumented function or block
+    '''
+    rows = sorted(_registry.values(), key=lambda s: getattr(s, sort), reverse=True)
+    lines = ['{:<40} {:>8} {:>11} {:>11} {:>12} {:>12}'.format(
+        'name', 'calls', 'total (s)', 'own (s)', 'items', 'peak (KiB)')]
+    for s in rows:
+        peak = '{:.1f}'.format(s.peak / 1024) if s.peak else '-'
+        lines.append('{:<40} {:>8} {:>11.4f} {:>11.4f} {:>12} {:>12}'.format(
+            s.name, s.calls, s.total, s.own, s.items or '-', peak))
+    return '\n'.join(lines)
+
+def dump_stats(path):
+    '''Write the registry in the marshal format used by cProfile/pstats.
+
+    Args:
+        path (str) : Output file, e.g. 'nightly.prof' (load with pstats.Stats(path))
+    '''
+    stats = {}
+    for key, s in _registry.items():
+        callers = {caller: (c[0], c[0], c[1], c[2]) for caller, c in s.callers.items()}
+        stats[key] = (s.calls, s.calls, s.own, s.total, callers)
+    with open(path, 'wb') as writeFile:
+        marshal.dump(stats, writeFile)
+
+def _report_at_exit():
+    if not _registry:
+        return
+    print(report())
+    dump = os.environ.get('HOTPATH_PROFILE_DUMP')
+    if dump:
+        dump_stats(dump)
+        print('Profile written to ' + dump)
+
+def _env_on(name):
+    '''True if environment switch name is set to anything but '' or '0'.'''
+    return os.environ.get(name) not in (None, '', '0')
+
+# opt in from the environment (HOTPATH_PROFILE_DUMP is a file name, so any non-empty value counts)
+if _env_on('HOTPATH_PROFILE') or os.environ.get('HOTPATH_PROFILE_DUMP'):
+    enable(memory=_env_on('HOTPATH_PROFILE_MEMORY'))
+    atexit.register(_report_at_exit)